@@ -1,7 +1,9 @@
 """
 Meal Planner Service - REST API endpoints
 """
+import json
 from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date
@@ -31,6 +33,11 @@ class MealPlanGenerateRequest(BaseModel):
     ingredient: Optional[str] = None
 
 
+class MealPlanItemsBatchRequest(BaseModel):
+    plan_ids: List[int]
+    counts_only: bool = False
+
+
 class MealPlanItemUpdateRequest(BaseModel):
     mealdb_id: Optional[int] = None
     meal_type: Optional[str] = None
@@ -95,6 +102,31 @@ async def generate_meal_plan(request: MealPlanGenerateRequest):
     )
 
 
+@app.post("/meal-plans/generate:stream")
+async def generate_meal_plan_stream(request: MealPlanGenerateRequest):
+    """
+    Generate a meal plan, streamed as NDJSON: the plan header first,
+    then one {"date", "meals"} line per day as soon as it is ready
+    """
+    meal_plan = meal_planner.start_meal_plan(
+        user_id=request.user_id,
+        num_days=request.num_days,
+        start_date=request.start_date
+    )
+    if not meal_plan:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to generate meal plan"
+        )
+
+    def lines():
+        yield json.dumps(meal_plan) + "\n"
+        for day in meal_planner.iter_plan_days(meal_plan, request.num_days, request.ingredient):
+            yield json.dumps(day) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/meal-plans/{meal_plan_id}")
 async def get_meal_plan(meal_plan_id: int):
     """Get a meal plan by ID"""
@@ -131,6 +163,12 @@ async def get_meal_plan_items(meal_plan_id: int):
     )
 
 
+@app.post("/meal-plans/items:batch")
+async def get_meal_plan_items_batch(request: MealPlanItemsBatchRequest):
+    """Get the items of several meal plans in a single call"""
+    return {"meal_plans": meal_planner.get_items_for_plans(request.plan_ids, request.counts_only)}
+
+
 @app.get("/meal-plans/user/{user_id}")
 async def get_user_meal_plans(user_id: int):
     """Get all meal plans for a user"""
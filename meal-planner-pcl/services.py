@@ -1,7 +1,7 @@
 """
 Meal Planner Service - Creates meal plans using the meal proposer service
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import date, timedelta
 import requests
 import os
@@ -119,6 +119,21 @@ class MealPlannerService:
         Returns:
             Generated meal plan with meals for each day
         """
+        meal_plan = self.start_meal_plan(user_id, num_days, start_date)
+        if not meal_plan:
+            return None
+        
+        days = self.iter_plan_days(meal_plan, num_days, ingredient)
+        meal_plan["days"] = {day["date"]: day["meals"] for day in days}
+        return meal_plan
+    
+    def start_meal_plan(self, user_id: int, num_days: int, start_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        Create the (still empty) meal plan in the database
+        
+        Returns:
+            Plan header (meal_plan_id, user_id, start_date, end_date) or None
+        """
         if start_date is None:
             start_date = date.today()
         
@@ -129,9 +144,21 @@ class MealPlannerService:
         if not meal_plan:
             return None
         
-        meal_plan_id = meal_plan.get("id")
+        return {
+            "meal_plan_id": meal_plan.get("id"),
+            "user_id": user_id,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat()
+        }
+    
+    def iter_plan_days(self, meal_plan: Dict[str, Any], num_days: int, ingredient: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Propose and store the meals of a plan created by start_meal_plan,
+        yielding each day ({"date", "meals"}) as soon as it is complete
+        """
+        meal_plan_id = meal_plan["meal_plan_id"]
+        start_date = date.fromisoformat(meal_plan["start_date"])
         meal_types = ["breakfast", "lunch", "dinner"]
-        days_meals = {}
         
         # Generate meals for each day
         for day_offset in range(num_days):
@@ -158,15 +185,7 @@ class MealPlannerService:
                             "meal_plan_item_id": meal_item["id"] if meal_item else None
                         }
             
-            days_meals[current_date.isoformat()] = day_meals
-        
-        return {
-            "meal_plan_id": meal_plan_id,
-            "user_id": user_id,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "days": days_meals
-        }
+            yield {"date": current_date.isoformat(), "meals": day_meals}
     
     def get_meal_plan(self, meal_plan_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -196,6 +215,28 @@ class MealPlannerService:
         result = self._make_request(url, method="GET")
         return result if result is not None else []
     
+    def get_items_for_plans(self, meal_plan_ids: List[int], counts_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the items of several meal plans at once
+        
+        Args:
+            meal_plan_ids: IDs of the meal plans
+            counts_only: Return only the number of items of each plan
+            
+        Returns:
+            One {"meal_plan_id", "items"} entry per requested plan
+            ({"meal_plan_id", "item_count"} with counts_only)
+        """
+        if counts_only:
+            return [
+                {"meal_plan_id": plan_id, "item_count": len(self.get_meal_plan_items(plan_id))}
+                for plan_id in meal_plan_ids
+            ]
+        return [
+            {"meal_plan_id": plan_id, "items": self.get_meal_plan_items(plan_id)}
+            for plan_id in meal_plan_ids
+        ]
+    
     def get_user_meal_plans(self, user_id: int) -> Optional[List[Dict[str, Any]]]:
         """
         Get all meal plans for a user
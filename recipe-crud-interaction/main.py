@@ -1,10 +1,43 @@
 import uvicorn
-from fastapi import FastAPI
+import hashlib
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from src.core.config import settings
 from src.api.v1.router import api_router
 
 app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
 
+# Endpoints served with an ETag for conditional GETs
+ETAG_PATHS = (f"{settings.API_V1_STR}/recipes/user/",)
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    """
+    Adds an ETag to rarely changing responses and answers 304 when the client
+    already holds the same payload (If-None-Match).
+    """
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or not request.url.path.startswith(ETAG_PATHS)
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    return Response(content=body, status_code=200, headers=headers, media_type=response.media_type)
+
+# Compress search results and recipe details for clients sending
+# Accept-Encoding: gzip (requests does by default). Added last so it wraps
+# the ETag middleware, which keeps hashing the uncompressed body.
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 @app.get("/health", tags=["System"])
 def health():
     return {"status": "ok"}
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from typing import List, Optional
 from src.schemas.review import ReviewCreate, ReviewResponse
 from src.services.review_service import ReviewService
 from src.api.deps import get_review_service, get_current_user
@@ -10,14 +10,21 @@ router = APIRouter()
 def read_reviews_by_recipe(
     recipe_id: str,
     type: str = Query("auto", enum=["auto", "external", "internal"], description="Specify if the ID is external (MealDB) or internal (Custom)"),
+    with_user_context: bool = Query(False, description="Add a per-review 'can_delete' flag for current_user_id"),
+    current_user_id: Optional[int] = Query(None, description="User the 'can_delete' flags refer to"),
     service: ReviewService = Depends(get_review_service)
 ):
     """
     Get reviews. 
     Use ?type=external for generic API recipes.
     Use ?type=internal for custom user recipes.
+    Use ?with_user_context=true&current_user_id=... to get 'can_delete' per review
+    (a UI hint only: deletion is still authorized on DELETE).
     """
-    return service.get_reviews_by_recipe(recipe_id, search_mode=type)
+    reviews = service.get_reviews_by_recipe(recipe_id, search_mode=type)
+    if with_user_context:
+        service.add_user_context(reviews, current_user_id)
+    return reviews
 
 @router.post("/", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
 async def create_review(
@@ -13,4 +13,5 @@ class ReviewResponse(BaseModel):
     user_id: int
     rating: int
     comment: str
-    created_at: str
\ No newline at end of file
+    created_at: str
+    can_delete: Optional[bool] = None
\ No newline at end of file
@@ -166,6 +166,8 @@ class RecipeService(BaseInternalClient):
                     for m in meals:
                         ext_id = str(m.get("id_external"))
                         if ext_id in known_external_ids: continue
+                        # Also skips repeats within the external results
+                        known_external_ids.add(ext_id)
                         
                         results.append({
                             "id": None,
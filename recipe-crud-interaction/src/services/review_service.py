@@ -25,6 +25,17 @@ class ReviewService(BaseInternalClient):
             
         return []
 
+    def add_user_context(self, reviews: List[Dict[str, Any]], current_user_id: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Flags the reviews written by current_user_id with 'can_delete'.
+        """
+        for review in reviews:
+            review["can_delete"] = (
+                current_user_id is not None
+                and str(review.get("user_id")) == str(current_user_id)
+            )
+        return reviews
+
     def get_reviews(self, recipe_id: int):
         return self.get_reviews_by_recipe(str(recipe_id), search_mode="auto")
 
@@ -1,16 +1,44 @@
 """
 Recipes Fetch Service - REST API endpoints
 """
-from fastapi import FastAPI, HTTPException, status, Depends
+from fastapi import FastAPI, HTTPException, status, Depends, Request, Response
 from pydantic import BaseModel
 from typing import Optional, List
 from services import RecipesFetchService
+import hashlib
 
 app = FastAPI(title="Recipes Fetch Service", version="1.0.0")
 
 # Initialize service
 recipes_fetch = RecipesFetchService()
 
+# Reference data that rarely changes: served with an ETag for conditional GETs
+ETAG_PATHS = ("/categories", "/areas", "/reference")
+
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    """
+    Adds an ETag to reference-data responses and answers 304 when the client
+    already holds the same payload (If-None-Match).
+    """
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or not request.url.path.startswith(ETAG_PATHS)
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    headers = dict(response.headers)
+    headers["ETag"] = etag
+    return Response(content=body, status_code=200, headers=headers, media_type=response.media_type)
+
 
 # Pydantic models
 class RecipeResponse(BaseModel):
@@ -140,6 +168,16 @@ async def get_areas():
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No areas found" )
 
 
+@app.get("/reference")
+async def get_reference_data():
+    """Get categories and areas together, for clients that need both"""
+    categories = recipes_fetch.list_all_categories()
+    areas = recipes_fetch.list_all_areas()
+    if categories and areas:
+        return {"categories": categories, "areas": areas}
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No reference data found")
+
+
 @app.get("/filter/area/{area}")
 async def filter_by_area(area: str):
     """Filter recipes by area (cuisine)"""
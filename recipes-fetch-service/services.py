@@ -6,6 +6,8 @@ import requests
 import redis
 import json
 import os
+import threading
+from cachetools import TTLCache
 
 # TheMealDB API base URL
 THEMEALDB_API_URL = "https://www.themealdb.com/api/json/v1/1"
@@ -21,6 +23,10 @@ class RecipesFetchService:
             host=os.getenv("REDIS_HOST", "redis"),
             port=int(os.getenv("REDIS_PORT", 6379)),
             decode_responses=True)
+        # In-process L1 cache consulted before Redis for hot lookups
+        self._local = TTLCache(maxsize=1024, ttl=60)
+        self._local_lock = threading.Lock()
+
     def _make_request(self, endpoint: str) -> Optional[Dict[str, Any]]:
     
         """Make a request to TheMealDB API"""
@@ -58,18 +64,27 @@ class RecipesFetchService:
     
     def lookup_by_id(self, meal_id: Any) -> Optional[Dict[str, Any]]:
         """Lookup a recipe by ID"""
+        local_key = str(meal_id)
+        with self._local_lock:
+            recipe = self._local.get(local_key)
+        if recipe is not None:
+            return recipe
+
         cache_key = f"recipe:external:{meal_id}"
         cached = self.cache.get(cache_key)
         if cached:
-            return json.loads(cached)
-        
-        result = self._make_request(f"lookup.php?i={meal_id}")
-        if result and result.get("meals"):
+            recipe = json.loads(cached)
+        else:
+            result = self._make_request(f"lookup.php?i={meal_id}")
+            if not (result and result.get("meals")):
+                return None
             recipe = result["meals"][0]
             # 3. Salva in Redis (es. scadenza 24h)
             self.cache.setex(cache_key, 86400, json.dumps(recipe))
-            return recipe
-        return None
+
+        with self._local_lock:
+            self._local[local_key] = recipe
+        return recipe
     
     def lookup_random(self) -> Optional[Dict[str, Any]]:
         """Lookup a random recipe"""
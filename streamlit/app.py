@@ -2,6 +2,8 @@
 Streamlit GUI - Main Entry Point
 """
 import streamlit as st
+from modules.config import MEAL_PLANS_URL, RECIPES_URL
+from modules.api import prefetch, prefetch_reference_data, SessionExpired
 from modules.auth import initialize_session_state, logout
 from modules.views.login import render_login_page
 from modules.views.meal_proposal import render_meal_proposal
@@ -21,11 +23,20 @@ st.set_page_config(
 def main():
     # 1. Initialize Session and Authentication State
     initialize_session_state()
+
+    # Warm up the user's data in the background while they pick a page
+    if st.session_state.authenticated:
+        user_id = st.session_state.get("user_id")
+        prefetch("user_recipes", f"{RECIPES_URL}/user/{user_id}")
+        prefetch("meal_plans", f"{MEAL_PLANS_URL}/user/{user_id}")
+        prefetch_reference_data()
     
     # 2. Sidebar Navigation
     with st.sidebar:
         st.title("🍽️ Meal Planner")
-        
+        nav = st.empty()
+
+    with nav.container():
         if st.session_state.authenticated:
             # Show user info if logged in
             user_name = st.session_state.user.get('full_name', 'User')
@@ -44,18 +55,31 @@ def main():
 
     # 3. Page Routing
     if not st.session_state.authenticated:
+        # Expired inside a fragment (see rerun_expired_session)
+        if st.session_state.pop("_session_expired", False):
+            st.error("Session expired. Please login again.")
+        render_login_page()
+        return
+
+    page = st.empty()
+    try:
+        with page.container():
+            if selection == "Meal Proposal":
+                render_meal_proposal()
+            elif selection == "Meal Planning":
+                render_meal_planning() 
+            elif selection == "My Recipes":
+                render_recipe_interaction()
+            elif selection == "Recipe Search":
+                render_recipe_search()
+            elif selection == "My Meal Plans":
+                render_my_meal_plans()
+    except SessionExpired:
+        # Token rejected mid-page: drop what was drawn and show login in this run
+        nav.empty()
+        page.empty()
+        st.error("Session expired. Please login again.")
         render_login_page()
-    else:
-        if selection == "Meal Proposal":
-            render_meal_proposal()
-        elif selection == "Meal Planning":
-            render_meal_planning() 
-        elif selection == "My Recipes":
-            render_recipe_interaction()
-        elif selection == "Recipe Search":
-            render_recipe_search()
-        elif selection == "My Meal Plans":
-            render_my_meal_plans()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,50 +1,147 @@
 import streamlit as st
 import requests
+import orjson
+import time
+import threading
+from cachetools import TTLCache
+from io import BytesIO
+from PIL import Image
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from modules.config import RECIPES_FETCH_URL, RECIPES_URL, RECIPE_SEARCH_URL, MEAL_PLANS_URL, CONNECT_TIMEOUT, REQUEST_TIMEOUT, CIRCUIT_FAILURES, CIRCUIT_COOLDOWN, TRUSTED_IMAGE_HOSTS, MAX_IMAGE_BYTES
 
-def make_request(url, method="GET", data=None, use_form_data=False):
+# (connect, read) timeouts for every backend call
+HTTP_TIMEOUT = (CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+
+@st.cache_resource
+def get_http_session():
     """
-    Make HTTP request to a service with automatic token handling.
+    Shared HTTP session, reused by every call so connections to the
+    backend services are kept alive instead of re-opened per request.
     """
-    headers = {}
+    session = requests.Session()
+    # Retry idempotent calls on transient gateway errors; the final response
+    # is still returned (raise_on_status=False) so make_request can handle it.
+    retry = Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
+class SessionExpired(Exception):
+    """
+    Raised by make_request on a 401 while authenticated. Caught once in
+    main(), which shows the login page in the same run instead of rerunning.
+    """
+
+def rerun_expired_session():
+    """
+    For SessionExpired caught inside an st.fragment: Streamlit does not let
+    exceptions escape a fragment (not even in a full run), so main() never
+    sees it. Flag it and rerun the app; main() reports it on the login page.
+    """
+    st.session_state["_session_expired"] = True
+    st.rerun()
+
+def _expire_session():
+    """
+    Handle a 401: only end the session if we thought we were authenticated
+    (a failed login attempt also gets a 401).
+    """
+    if st.session_state.get("authenticated"):
+        st.session_state.authenticated = False
+        st.session_state.token = None
+        raise SessionExpired()
+
+def _json_body(data, headers):
+    """Encode a JSON request body with orjson; returns (body, headers)."""
+    return orjson.dumps(data), {**headers, "Content-Type": "application/json"}
+
+def _build_headers():
+    """
+    Auth headers for the current token. Built once per token and shared,
+    so callers must copy the dict before adding to it.
+    """
     # Check if a token exists in session_state, regardless of 'authenticated' flag.
     # This allows calling /me during the login handshake.
     token = st.session_state.get("token")
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    cached = st.session_state.get("_auth_headers")
+    if cached and cached[0] == token:
+        return cached[1]
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    st.session_state["_auth_headers"] = (token, headers)
+    return headers
+
+# --- Circuit breaker (per session, per service host) ---
+def _service_down(service):
+    deadline = st.session_state.get(f"_svc_down_{service}")
+    return deadline is not None and time.monotonic() < deadline
+
+def _record_failure(service):
+    fails = st.session_state.get(f"_svc_fails_{service}", 0) + 1
+    if fails >= CIRCUIT_FAILURES:
+        st.session_state[f"_svc_down_{service}"] = time.monotonic() + CIRCUIT_COOLDOWN
+        fails = 0
+    st.session_state[f"_svc_fails_{service}"] = fails
+
+def _record_success(service):
+    st.session_state.pop(f"_svc_fails_{service}", None)
+    st.session_state.pop(f"_svc_down_{service}", None)
+
+def make_request(url, method="GET", data=None, use_form_data=False, params=None):
+    """
+    Make HTTP request to a service with automatic token handling.
+    Query parameters go in `params` and are URL-encoded by requests.
+    """
+    headers = _build_headers()
+
+    # Conditional GET: send back the ETag of the body we already hold
+    etags = st.session_state.setdefault("_etags", {})
+    etag_key = (url, tuple(sorted(params.items()))) if params else url
+    if method == "GET" and etag_key in etags:
+        headers = {**headers, "If-None-Match": etags[etag_key][0]}
 
     # Validation for form data
     assert not use_form_data or method == "POST", "use_form_data is only valid for POST requests"
 
+    # Don't wait on timeouts again for a service that just kept failing
+    service = urlsplit(url).netloc
+    if _service_down(service):
+        st.error(f"Service {service} is temporarily unavailable. Please try again shortly.")
+        return None
+
+    if data is not None and not use_form_data:
+        data, headers = _json_body(data, headers)
+
     try:
-        response = None
-        if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            if use_form_data:
-                response = requests.post(url, data=data, headers=headers)
-            else:
-                response = requests.post(url, json=data, headers=headers)
-        elif method == "PUT":
-            response = requests.put(url, json=data, headers=headers)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers)
-        
-        if response is None:
-            return None
-            
+        response = get_http_session().request(
+            method,
+            url,
+            params=params,
+            data=data,
+            headers=headers,
+            timeout=HTTP_TIMEOUT,
+        )
+        _record_success(service)
+
         # Response handling
         if response.status_code in [200, 201]:
-            return response.json()
+            body = orjson.loads(response.content)
+            etag = response.headers.get("ETag")
+            if method == "GET" and etag:
+                etags[etag_key] = (etag, body)
+            return body
+
+        elif response.status_code == 304:
+            # Not modified: reuse the body stored with the ETag
+            return etags.get(etag_key, (None, None))[1]
             
         elif response.status_code == 401:
             # Handle unauthorized access
-            # Only trigger a full logout/rerun if we thought we were authenticated
-            if st.session_state.get("authenticated"):
-                st.error("Session expired. Please login again.")
-                st.session_state.authenticated = False
-                st.session_state.token = None
-                st.rerun()
+            _expire_session()
             return None
             
         elif response.status_code == 403:
@@ -52,13 +149,293 @@ def make_request(url, method="GET", data=None, use_form_data=False):
             
         elif response.status_code == 422:
             try:
-                detail = response.json().get('detail')
+                detail = orjson.loads(response.content).get('detail')
                 st.error(f"Validation Error (422): {detail}")
-            except:
+            except (orjson.JSONDecodeError, AttributeError):
                 st.error(f"Validation Error (422): {response.text}")
             
         return None
         
+    except (requests.ConnectionError, requests.Timeout) as e:
+        _record_failure(service)
+        st.error(f"Error connecting to service: {e}")
+        return None
     except requests.RequestException as e:
         st.error(f"Error connecting to service: {e}")
-        return None
\ No newline at end of file
+        return None
+    except orjson.JSONDecodeError:
+        # e.g. an HTML error page from a proxy in front of the service
+        st.error(f"Invalid response from service {service}.")
+        return None
+
+def stream_ndjson(url, data):
+    """
+    POST `data` and yield each line of an NDJSON response as soon as it
+    arrives. Errors are shown with st.error (once, here) and end the stream;
+    a 401 raises SessionExpired like make_request.
+    """
+    body, headers = _json_body(data, _build_headers())
+    try:
+        with get_http_session().post(
+            url, data=body, headers=headers, timeout=HTTP_TIMEOUT, stream=True
+        ) as response:
+            if response.status_code == 401:
+                _expire_session()
+            if response.status_code != 200:
+                st.error(f"Request failed ({response.status_code}). The service might be busy.")
+                return
+            received = False
+            for line in response.iter_lines():
+                if line:
+                    received = True
+                    yield orjson.loads(line)
+            if not received:
+                st.error("Empty response from service.")
+    except requests.RequestException as e:
+        st.error(f"Error connecting to service: {e}")
+    except orjson.JSONDecodeError:
+        st.error("Invalid response from service.")
+
+def _get_json(url, headers, session):
+    """
+    Plain GET over the given session. Does not touch Streamlit state or
+    cached functions, so it is safe to run from worker threads: callers
+    resolve the session with get_http_session() on the script thread.
+    """
+    try:
+        response = session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code not in [200, 201]:
+            return None
+        return orjson.loads(response.content)
+    except (requests.RequestException, orjson.JSONDecodeError):
+        return None
+
+def fetch_many(urls, max_workers=8):
+    """
+    Fetch several GET endpoints concurrently over the shared session.
+    Returns the decoded bodies in the same order as `urls` (None for failures).
+    Worker threads have no Streamlit context, so errors are not reported here.
+    """
+    if not urls:
+        return []
+
+    session, headers = get_http_session(), _build_headers()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(lambda url: _get_json(url, headers, session), urls))
+
+# --- Background prefetch ---
+@st.cache_resource
+def _prefetch_pool():
+    return ThreadPoolExecutor(max_workers=4)
+
+def prefetch(key, url):
+    """
+    Start fetching `url` in the background, at most once per session.
+    The result is picked up by the page with take_prefetched(key).
+    """
+    state_key = f"_prefetch_{key}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = _prefetch_pool().submit(
+            _get_json, url, _build_headers(), get_http_session()
+        )
+
+def take_prefetched(key):
+    """
+    Result of a pending prefetch (None if missing, failed or already taken).
+    Each prefetch is served once; later renders go through the normal path.
+    """
+    state_key = f"_prefetch_{key}"
+    future = st.session_state.get(state_key)
+    if future is None:
+        return None
+    st.session_state[state_key] = None
+    try:
+        return future.result(timeout=REQUEST_TIMEOUT)
+    except Exception:
+        return None
+
+def discard_prefetched(key):
+    """Drop a pending prefetch whose data is known to be stale."""
+    st.session_state[f"_prefetch_{key}"] = None
+
+# --- Cached lookups ---
+class _EmptyResponse(Exception):
+    """Raised inside cached fetchers so that failed calls are not memoized."""
+
+def _get_or_raise(url, params=None):
+    data = make_request(url, params=params)
+    if data is None:
+        raise _EmptyResponse(url)
+    return data
+
+def _none_on_failure(cached_fn, *args):
+    try:
+        return cached_fn(*args)
+    except _EmptyResponse:
+        return None
+
+@st.cache_resource
+def _reference_prefetch():
+    """Background fetch of the static reference data, started once per process."""
+    return _prefetch_pool().submit(
+        _get_json, f"{RECIPES_FETCH_URL}/reference", {}, get_http_session()
+    )
+
+def prefetch_reference_data():
+    """Start loading categories and areas in the background (once per process)."""
+    _reference_prefetch()
+
+# Categories and areas are static: fetched together from /reference and
+# persisted to disk so they survive restarts
+# (Streamlit does not apply TTLs to disk-persisted caches).
+@st.cache_data(persist="disk", show_spinner=False)
+def _cached_reference():
+    try:
+        data = _reference_prefetch().result(timeout=REQUEST_TIMEOUT)
+    except Exception:
+        data = None
+    return data if data is not None else _get_or_raise(f"{RECIPES_FETCH_URL}/reference")
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _cached_user_recipes(user_id):
+    return _get_or_raise(f"{RECIPES_URL}/user/{user_id}")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_meal_plans(user_id):
+    return _get_or_raise(f"{MEAL_PLANS_URL}/user/{user_id}")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_plan_item_counts(plan_ids):
+    batch = make_request(
+        f"{MEAL_PLANS_URL}/items:batch",
+        method="POST",
+        data={"plan_ids": list(plan_ids), "counts_only": True}
+    )
+    if batch is None:
+        raise _EmptyResponse("items:batch")
+    return {entry.get("meal_plan_id"): entry.get("item_count") for entry in batch.get("meal_plans", [])}
+
+@st.cache_resource
+def _recipe_details():
+    """
+    Recipe details shared by all sessions for 10 minutes. A plain TTLCache
+    behind a lock rather than st.cache_data, so the search prefetch workers
+    can read and fill it too. Obtain it on the script thread.
+    """
+    return TTLCache(maxsize=500, ttl=600), threading.Lock()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_search(param, value):
+    return _get_or_raise(RECIPE_SEARCH_URL, params={param: value})
+
+def get_categories():
+    """MealDB categories (static reference data, persisted cache)."""
+    reference = _none_on_failure(_cached_reference)
+    return {"categories": reference["categories"]} if reference else None
+
+def get_areas():
+    """MealDB areas (static reference data, persisted cache)."""
+    reference = _none_on_failure(_cached_reference)
+    return {"areas": reference["areas"]} if reference else None
+
+def get_user_recipes(user_id):
+    """Custom recipes of a user, cached briefly. See clear_user_recipes()."""
+    return _none_on_failure(_cached_user_recipes, user_id)
+
+def search_recipes(param, value):
+    """Unified recipe search (custom + MealDB), cached for 5 minutes."""
+    return _none_on_failure(_cached_search, param, value)
+
+def get_user_meal_plans(user_id):
+    """Saved meal plans of a user, cached for 5 minutes. See clear_meal_plans()."""
+    return _none_on_failure(_cached_meal_plans, user_id)
+
+def get_plan_item_counts(plan_ids):
+    """{plan_id: number of items} for several plans via the batch endpoint, cached for 5 minutes."""
+    return _none_on_failure(_cached_plan_item_counts, tuple(plan_ids))
+
+def clear_meal_plans():
+    """Invalidate the cached meal plans after a plan is generated or deleted."""
+    _cached_meal_plans.clear()
+    _cached_plan_item_counts.clear()
+
+def get_recipe_detail(item_id):
+    """Full recipe detail, shared by all sessions for 10 minutes."""
+    details, lock = _recipe_details()
+    item_id = str(item_id)
+    with lock:
+        data = details.get(item_id)
+    if data is None:
+        data = make_request(f"{RECIPES_URL}/{item_id}")
+        if data is not None:
+            with lock:
+                details[item_id] = data
+    return data
+
+def get_recipe_details(item_ids, max_workers=8):
+    """
+    {item_id: detail} for several recipes: cached ones from the shared detail
+    cache, the others fetched concurrently, and stored there by the workers.
+    Failed fetches map to None.
+    """
+    details, lock = _recipe_details()
+    item_ids = [str(item_id) for item_id in item_ids]
+    with lock:
+        found = {item_id: details.get(item_id) for item_id in item_ids}
+    missing = [item_id for item_id, data in found.items() if data is None]
+    if not missing:
+        return found
+
+    session, headers = get_http_session(), _build_headers()
+
+    def load(item_id):
+        data = _get_json(f"{RECIPES_URL}/{item_id}", headers, session)
+        if data is not None:
+            with lock:
+                details[item_id] = data
+        return data
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+        found.update(zip(missing, executor.map(load, missing)))
+    return found
+
+def clear_user_recipes():
+    """Invalidate the cached user recipes after an add/delete."""
+    _cached_user_recipes.clear()
+    # Custom recipes also show up in search results and details
+    _cached_search.clear()
+    details, lock = _recipe_details()
+    with lock:
+        details.clear()
+
+class _UnusableImage(Exception):
+    """The download is not an image st.image can decode, or is too large."""
+
+@st.cache_data(ttl=7 * 86400, max_entries=256, show_spinner=False)
+def _cached_image(url):
+    with get_http_session().get(url, timeout=HTTP_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        if not response.headers.get("Content-Type", "").startswith("image/"):
+            raise _UnusableImage(url)
+        content = response.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+    if len(content) > MAX_IMAGE_BYTES:
+        raise _UnusableImage(url)
+    try:
+        Image.open(BytesIO(content)).verify()
+    except Exception:
+        raise _UnusableImage(url)
+    return content
+
+def fetch_image(url):
+    """
+    Image for st.image: bytes downloaded once and cached in process memory for
+    TheMealDB images, the URL itself (loaded by the browser) for any other host
+    or if the download fails.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or parts.hostname not in TRUSTED_IMAGE_HOSTS:
+        return url
+    try:
+        return _cached_image(url)
+    except (requests.RequestException, _UnusableImage):
+        return url
@@ -1,6 +1,6 @@
 import streamlit as st
 import extra_streamlit_components as stx
-from modules.config import AUTH_SERVICE_URL
+from modules.config import AUTH_API_URL
 from modules.api import make_request
 import time
 
@@ -16,8 +16,10 @@ def logout():
     Performs a complete logout.
     """
     cookie_manager.delete("access_token")
+    _resolve_me.clear()
     
-    keys_to_clear = ["authenticated", "user", "user_id", "token", "current_meal_plan"]
+    keys_to_clear = ["authenticated", "user", "user_id", "token", "current_meal_plan", "_cookie_checked"]
+    keys_to_clear += [key for key in st.session_state if key.startswith(("_prefetch_", "reviews_"))]
     for key in keys_to_clear:
         if key in st.session_state:
             del st.session_state[key]
@@ -27,19 +29,31 @@ def logout():
     st.rerun()
 
 # --- 3. User Data Fetching ---
+class _InvalidToken(Exception):
+    """Raised inside the cached /me lookup so that failures are not memoized."""
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _resolve_me(token):
+    # Il token è la chiave della cache; make_request lo legge dalla sessione
+    user_data = make_request(f"{AUTH_API_URL}/me")
+    if not (user_data and "id" in user_data):
+        raise _InvalidToken()
+    return user_data
+
 def fetch_current_user():
     token = st.session_state.get("token")
     if not token: return False
     
     # /me ora restituisce subito l'ID!
-    user_data = make_request(f"{AUTH_SERVICE_URL}/api/v1/auth/me")
+    try:
+        user_data = _resolve_me(token)
+    except _InvalidToken:
+        return False
     
-    if user_data and "id" in user_data:
-        st.session_state.user = user_data
-        st.session_state.user_id = user_data["id"]
-        st.session_state.authenticated = True
-        return True
-    return False
+    st.session_state.user = user_data
+    st.session_state.user_id = user_data["id"]
+    st.session_state.authenticated = True
+    return True
 
 # --- 4. Session Initialization ---
 def initialize_session_state():
@@ -62,7 +76,12 @@ def initialize_session_state():
         return
 
     # --- FIX 2: Gestione Cookie ---
-    cookie_token = cookie_manager.get(cookie="access_token")
+    # Il cookie viene letto una sola volta per sessione (reset al logout)
+    if not st.session_state.get("_cookie_checked"):
+        cookie_token = cookie_manager.get(cookie="access_token")
+        st.session_state._cookie_checked = True
+    else:
+        cookie_token = None
     if cookie_token and not st.session_state.authenticated:
         st.session_state.token = cookie_token
         if not fetch_current_user():
@@ -77,6 +96,12 @@ def initialize_session_state():
     query_params = st.query_params
     if "access_token" in query_params:
         token = query_params["access_token"]
+
+        # Token già consumato in questa sessione: niente da rifare
+        if st.session_state.get("_oauth_consumed") == token:
+            st.query_params.clear()
+            return
+        st.session_state["_oauth_consumed"] = token
         
         # Impostiamo il token
         st.session_state.token = token
@@ -86,12 +111,12 @@ def initialize_session_state():
             # 1. Impostiamo il cookie
             cookie_manager.set("access_token", token, key="google_auth_token")
             # 2. Puliamo l'URL
+            # Nessun st.rerun(): lo stato è già autenticato e il resto di main()
+            # renderizza la UI in questo stesso passaggio.
             st.query_params.clear()
-            # 3. Importante: Rerun per aggiornare la UI e rimuovere i parametri visivamente
-            st.rerun()
         else:
             # FAIL: Token invalido
             st.error("Login failed: The token received is invalid or expired.")
             # Puliamo tutto per evitare loop infiniti
             st.session_state.token = None
-            st.query_params.clear()
\ No newline at end of file
+            st.query_params.clear()
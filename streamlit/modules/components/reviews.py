@@ -1,8 +1,14 @@
 import streamlit as st
-from modules.config import RECIPE_CRUD_URL, API_VERSION
+import time
+from modules.config import REVIEWS_URL
 from modules.api import make_request
 
-recipe_url = f"{RECIPE_CRUD_URL}/{API_VERSION}"
+# Reviews are kept in session_state for this long, so the rerun after a
+# post/delete renders from memory instead of refetching the list.
+REVIEWS_TTL = 60
+
+# Star strings indexed by rating (0-5)
+_STARS = ("☆☆☆☆☆", "★☆☆☆☆", "★★☆☆☆", "★★★☆☆", "★★★★☆", "★★★★★")
 
 def render_reviews_section(external_id, recipe_name, recipe_id=None):
     """
@@ -17,20 +23,46 @@ def render_reviews_section(external_id, recipe_name, recipe_id=None):
     _render_reviews_list(safe_ext_id, recipe_id)
     _render_review_form(safe_ext_id, recipe_id)
 
+def _is_custom_pure(external_id, recipe_id):
+    return (external_id == "None" or not external_id) and recipe_id
+
+def _reviews_cache_key(external_id, recipe_id):
+    if _is_custom_pure(external_id, recipe_id):
+        return f"reviews_int_{recipe_id}"
+    return f"reviews_ext_{external_id}"
+
+def _load_reviews(fetch_url, cache_key):
+    cached = st.session_state.get(cache_key)
+    if cached and time.time() - cached[0] < REVIEWS_TTL:
+        return cached[1]
+
+    reviews = make_request(fetch_url)
+    if reviews is not None:
+        st.session_state[cache_key] = (time.time(), reviews)
+    return reviews
+
+def _update_cached_reviews(cache_key, update):
+    cached = st.session_state.get(cache_key)
+    if cached:
+        st.session_state[cache_key] = (cached[0], update(cached[1]))
+
 def _render_reviews_list(external_id, recipe_id):
     # 1. FETCH (Internal vs External)
-    is_custom_pure = (external_id == "None" or not external_id) and recipe_id
-    
-    if is_custom_pure:
-        fetch_url = f"{recipe_url}/reviews/recipe/{recipe_id}?type=internal"
+    if _is_custom_pure(external_id, recipe_id):
+        fetch_url = f"{REVIEWS_URL}/recipe/{recipe_id}?type=internal"
     else:
         if external_id == "None":
             st.warning("Cannot load reviews: Missing recipe ID.")
             return
-        fetch_url = f"{recipe_url}/reviews/recipe/{external_id}?type=external"
+        fetch_url = f"{REVIEWS_URL}/recipe/{external_id}?type=external"
+
+    current_user_id = st.session_state.get("user_id")
+    if current_user_id:
+        fetch_url += f"&with_user_context=true&current_user_id={current_user_id}"
 
     # 2. API CALL
-    reviews = make_request(fetch_url)
+    cache_key = _reviews_cache_key(external_id, recipe_id)
+    reviews = _load_reviews(fetch_url, cache_key)
     
     if not reviews:
         st.info("No reviews yet. Be the first to review!")
@@ -41,19 +73,22 @@ def _render_reviews_list(external_id, recipe_id):
         with st.container(border=True):
             c1, c2 = st.columns([6, 1])
             with c1:
-                rating_val = rev.get('rating', 0)
-                stars = "★" * rating_val + "☆" * (5 - rating_val)
+                rating_val = rev.get('rating') or 0
+                stars = _STARS[max(0, min(5, rating_val))]
+                created_at_short = (rev.get('created_at') or '')[:10]
                 st.markdown(f"**{rev.get('username', 'Unknown')}** {stars}")
                 st.write(rev.get('comment', ''))
-                st.caption(f"Date: {rev.get('created_at', '')[:10]}")
+                st.caption(f"Date: {created_at_short}")
             
             with c2:
-                current_user_id = st.session_state.get("user_id")
-                if current_user_id and str(rev.get("user_id")) == str(current_user_id):
+                if rev.get("can_delete"):
                     btn_key = f"del_{external_id}_{rev['id']}"
                     
                     if st.button("🗑️", key=btn_key, help="Delete your review"):
-                        if make_request(f"{recipe_url}/reviews/{rev['id']}", method="DELETE"):
+                        if make_request(f"{REVIEWS_URL}/{rev['id']}", method="DELETE"):
+                            _update_cached_reviews(
+                                cache_key, lambda revs: [r for r in revs if r.get("id") != rev["id"]]
+                            )
                             st.toast("Review deleted!")
                             st.rerun()
 
@@ -92,6 +127,12 @@ def _render_review_form(external_id, recipe_id):
                 "recipe_id": recipe_id
             }
             
-            if make_request(f"{recipe_url}/reviews/", method="POST", data=payload):
+            new_review = make_request(f"{REVIEWS_URL}/", method="POST", data=payload)
+            if new_review:
+                new_review["can_delete"] = True
+                new_review.setdefault("username", st.session_state.get("user", {}).get("username"))
+                _update_cached_reviews(
+                    _reviews_cache_key(external_id, recipe_id), lambda revs: [new_review] + revs
+                )
                 st.success("Review posted!")
                 st.rerun()
\ No newline at end of file
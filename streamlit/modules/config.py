@@ -8,4 +8,28 @@ MEAL_PLANNER_URL = os.getenv("MEAL_PLANNER_URL", "http://meal-planner-pcl:8004")
 RECIPE_CRUD_URL = os.getenv("RECIPE_CRUD_URL", "http://recipe-crud-interaction:8005")
 RECIPES_FETCH_URL = os.getenv("RECIPES_FETCH_URL", "http://recipes-fetch-service:8006")
 
-API_VERSION = os.getenv("API_VERSION", "api/v1")
\ No newline at end of file
+API_VERSION = os.getenv("API_VERSION", "api/v1")
+RECIPE_API_BASE = f"{RECIPE_CRUD_URL}/{API_VERSION}"
+
+# Endpoint prefixes
+AUTH_API_URL = f"{AUTH_SERVICE_URL}/api/v1/auth"
+MEAL_PLANS_URL = f"{MEAL_PLANNER_URL}/meal-plans"
+RECIPES_URL = f"{RECIPE_API_BASE}/recipes"
+RECIPE_SEARCH_URL = f"{RECIPES_URL}/search"
+REVIEWS_URL = f"{RECIPE_API_BASE}/reviews"
+
+# HTTP client
+CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "3"))
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "10"))
+# A service that fails this many calls in a row is skipped for CIRCUIT_COOLDOWN seconds
+CIRCUIT_FAILURES = int(os.getenv("CIRCUIT_FAILURES", "3"))
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "30"))
+
+# Recipe search: fetch the full details of every result right after a
+# search, not only the first ones (one detail request per result)
+SEARCH_PREFETCH_ALL = os.getenv("SEARCH_PREFETCH_ALL", "false").lower() == "true"
+
+# Images are downloaded (and cached) server-side only from these hosts;
+# any other URL, e.g. one typed into a custom recipe, is left to the browser
+TRUSTED_IMAGE_HOSTS = ("www.themealdb.com",)
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", str(2 * 1024 * 1024)))
@@ -1,39 +1,57 @@
+import html
+
+# TheMealDB flat ingredient/measure keys, in order
+_MEALDB_KEYS = tuple((f"strIngredient{i}", f"strMeasure{i}") for i in range(1, 21))
+
 def get_ingredients_list(meal):
     """
     Extract and format the ingredient list ingredienti from a past object.
+    The result is memoized on the meal dict itself, which lives in
+    session_state, so each recipe is only formatted once per session.
     """
-    final_list = []
+    ingredients = meal.get("_ingredients")
+    if ingredients is None:
+        ingredients = meal["_ingredients"] = _build_ingredients_list(meal)
+    return ingredients
 
-    if "ingredients" in meal and isinstance(meal["ingredients"], list):
-        for item in meal["ingredients"]:
-            if not isinstance(item, dict):
-                continue
+def _format_ingredient(raw_ing, raw_meas):
+    ing_name = (raw_ing or "").strip()
+    if not ing_name:
+        return None
+    meas = (raw_meas or "").strip()
+    # Se c'è la misura, aggiungiamo uno spazio dopo, altrimenti stringa vuota
+    return f"• {meas} {ing_name}" if meas else f"• {ing_name}"
 
-            
-            ing_name = (item.get("ingredient") or item.get("name") or "").strip()
-            meas = (item.get("measure") or "").strip()
-            
-            if ing_name:
-                # Se c'è la misura, aggiungiamo uno spazio dopo, altrimenti stringa vuota
-                meas_part = f"{meas} " if meas else ""
-                final_list.append(f"• {meas_part}{ing_name}")
+def _build_ingredients_list(meal):
+    ingredients = meal.get("ingredients")
+    if isinstance(ingredients, list):
+        formatted = (
+            _format_ingredient(item.get("ingredient") or item.get("name"), item.get("measure"))
+            for item in ingredients if isinstance(item, dict)
+        )
+        final_list = [line for line in formatted if line]
         
         # Se abbiamo trovato ingredienti con questo metodo, usiamo questi e ci fermiamo.
         if final_list:
             return final_list
 
-    for i in range(1, 21):
-        ing_key = f"strIngredient{i}"
-        meas_key = f"strMeasure{i}"
-        
+    final_list = []
+    for ing_key, meas_key in _MEALDB_KEYS:
         raw_ing = meal.get(ing_key)
         raw_meas = meal.get(meas_key)
+        # MealDB fills the slots in order: nothing follows the first empty pair
+        if raw_ing is None and raw_meas is None:
+            break
 
-        clean_ing = (raw_ing or "").strip()
-        clean_meas = (raw_meas or "").strip()
-
-        if clean_ing:
-            meas_part = f"{clean_meas} " if clean_meas else ""
-            final_list.append(f"• {meas_part}{clean_ing}")
+        line = _format_ingredient(raw_ing, raw_meas)
+        if line:
+            final_list.append(line)
             
-    return final_list
\ No newline at end of file
+    return final_list
+
+def lazy_img(url, width=180):
+    """
+    HTML <img> that the browser loads lazily and decodes off the main thread,
+    instead of Streamlit fetching the image during the rerun.
+    """
+    return f'<img loading="lazy" decoding="async" src="{html.escape(url)}" width="{width}">'
@@ -1,7 +1,6 @@
 import streamlit as st
-import requests
-from modules.config import AUTH_SERVICE_URL
-from modules.api import make_request
+from modules.config import AUTH_API_URL
+from modules.api import make_request, get_http_session, HTTP_TIMEOUT
 from modules.auth import fetch_current_user, cookie_manager
 
 def render_login_page():
@@ -11,14 +10,16 @@ def render_login_page():
     
     # --- TAB Classic Logic ---
     with tab1:
-        username = st.text_input("Username", key="login_username")
-        password = st.text_input("Password", type="password", key="login_password")
+        with st.form("login_form", border=False):
+            username = st.text_input("Username", key="login_username")
+            password = st.text_input("Password", type="password", key="login_password")
+            submitted = st.form_submit_button("Login")
         
-        if st.button("Login"):
+        if submitted:
             if username and password:
                 data = {"username": username, "password": password}
                 # Classic Login
-                result = make_request(f"{AUTH_SERVICE_URL}/api/v1/auth/login", method="POST", data=data, use_form_data=True)
+                result = make_request(f"{AUTH_API_URL}/login", method="POST", data=data, use_form_data=True)
                 
                 if result and "access_token" in result:
                     # 1. Save token in session
@@ -42,15 +43,17 @@ def render_login_page():
 
 def render_register_tab():
     st.subheader("Create Account")
-    reg_u = st.text_input("Username", key="reg_u")
-    reg_p = st.text_input("Password", type="password", key="reg_p")
-    reg_fn = st.text_input("Full Name", key="reg_fn")
-    reg_e = st.text_input("Email", key="reg_e")
+    with st.form("register_form", border=False):
+        reg_u = st.text_input("Username", key="reg_u")
+        reg_p = st.text_input("Password", type="password", key="reg_p")
+        reg_fn = st.text_input("Full Name", key="reg_fn")
+        reg_e = st.text_input("Email", key="reg_e")
+        submitted = st.form_submit_button("Register")
     
-    if st.button("Register"):
+    if submitted:
         data = {"username": reg_u, "password": reg_p, "full_name": reg_fn, "email": reg_e}
         
-        if make_request(f"{AUTH_SERVICE_URL}/api/v1/auth/register", method="POST", data=data):
+        if make_request(f"{AUTH_API_URL}/register", method="POST", data=data):
             st.success("Account created! Please login.")
 
 def render_google_tab():
@@ -58,7 +61,7 @@ def render_google_tab():
     if st.button("Login with Google"):
         try:
             # Richiediamo l'URL di redirect al backend
-            resp = requests.get(f"{AUTH_SERVICE_URL}/api/v1/auth/google/login", allow_redirects=False)
+            resp = get_http_session().get(f"{AUTH_API_URL}/google/login", allow_redirects=False, timeout=HTTP_TIMEOUT)
             if resp.status_code == 307:
                 st.link_button("Continue to Google", resp.headers.get("location"), type="primary")
             else:
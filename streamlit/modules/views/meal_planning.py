@@ -1,7 +1,11 @@
 import streamlit as st
+import html
 from datetime import date
-from modules.config import MEAL_PLANNER_URL
-from modules.api import make_request
+from modules.config import MEAL_PLANS_URL
+from modules.api import stream_ndjson, discard_prefetched, clear_meal_plans
+from modules.utils import lazy_img
+
+MEAL_SLOTS = (("Breakfast", "breakfast"), ("Lunch", "lunch"), ("Dinner", "dinner"))
 
 def render_meal_planning():
     """
@@ -10,73 +14,100 @@ def render_meal_planning():
     st.header("📅 Meal Planning")
     
     col1, col2 = st.columns([1, 2])
+    payload = None
     
     # --- Left Column: Input Form ---
     with col1:
-        with st.container(border=True):
+        with st.form("generate_plan_form"):
             st.subheader("Generate New Plan")
             num_days = st.number_input("Number of Days", min_value=1, max_value=30, value=7)
             start_date = st.date_input("Start Date", value=date.today())
             ingredient = st.text_input("Preferred Ingredient (optional)", placeholder="e.g. Chicken")
             
-            if st.button("Generate Plan", type="primary"):
+            if st.form_submit_button("Generate Plan", type="primary"):
                 user_id = st.session_state.get("user_id")
                 
                 if not user_id:
                     st.error("User ID not found. Please login again.")
                 else:
-                    with st.spinner("Generating your meal plan..."):
-                        payload = {
-                            "user_id": user_id,
-                            "num_days": num_days,
-                            "start_date": start_date.isoformat(),
-                            "ingredient": ingredient if ingredient else None
-                        }
-                        # Call the Meal Planner Service
-                        result = make_request(f"{MEAL_PLANNER_URL}/meal-plans/generate", method="POST", data=payload)
-                    
-                    if result:
-                        st.session_state.current_meal_plan = result
-                        st.success("Meal plan generated and saved successfully!")
-                    else:
-                        st.error("Failed to generate meal plan. The service might be busy.")
+                    payload = {
+                        "user_id": user_id,
+                        "num_days": num_days,
+                        "start_date": start_date.isoformat(),
+                        "ingredient": ingredient if ingredient else None
+                    }
     
     # --- Right Column: Plan Visualization ---
     with col2:
-        if "current_meal_plan" in st.session_state and st.session_state.current_meal_plan:
+        if payload:
+            _generate_meal_plan(payload)
+        elif "current_meal_plan" in st.session_state and st.session_state.current_meal_plan:
             display_meal_plan(st.session_state.current_meal_plan)
         else:
             st.info("👈 Use the form on the left to generate a personalized meal plan.")
 
+def _generate_meal_plan(payload):
+    """
+    Calls the streaming generate endpoint and draws each day as soon as
+    the Meal Planner Service sends it, instead of waiting for the whole plan.
+    """
+    lines = stream_ndjson(f"{MEAL_PLANS_URL}/generate:stream", payload)
+    meal_plan = next(lines, None)
+    if not meal_plan:
+        # stream_ndjson has already reported the failure
+        return
+
+    meal_plan["days"] = {}
+    _render_plan_header(meal_plan)
+    with st.spinner("Generating your meal plan..."):
+        for i, day in enumerate(lines):
+            meal_plan["days"][day["date"]] = day["meals"]
+            _render_day(i, day["date"], day["meals"])
+
+    st.session_state.current_meal_plan = meal_plan
+    discard_prefetched("meal_plans")
+    clear_meal_plans()
+    if len(meal_plan["days"]) == payload["num_days"]:
+        st.success("Meal plan generated and saved successfully!")
+    else:
+        st.warning("Generation was interrupted; the days above were saved.")
+
 def display_meal_plan(meal_plan):
     """
     Helper function to display the meal plan details.
     """
-    st.subheader(f"Plan: {meal_plan.get('start_date')} to {meal_plan.get('end_date')}")
-    st.caption(f"Plan ID: {meal_plan.get('meal_plan_id')} (Saved in database)")
+    _render_plan_header(meal_plan)
     
     # Iterate through days (ensure it handles dict correctly)
     days = meal_plan.get("days", {})
     
-    for day_date, meals in days.items():
-        with st.expander(f"📆 {day_date}", expanded=True):
-            c_brk, c_lun, c_din = st.columns(3)
-            
-            _render_meal_slot(c_brk, "Breakfast", meals.get("breakfast"))
-            _render_meal_slot(c_lun, "Lunch", meals.get("lunch"))
-            _render_meal_slot(c_din, "Dinner", meals.get("dinner"))
+    for i, (day_date, meals) in enumerate(days.items()):
+        _render_day(i, day_date, meals)
+
+def _render_plan_header(meal_plan):
+    st.subheader(f"Plan: {meal_plan.get('start_date')} to {meal_plan.get('end_date')}")
+    st.caption(f"Plan ID: {meal_plan.get('meal_plan_id')} (Saved in database)")
+
+def _render_day(i, day_date, meals):
+    # Only the first days start expanded; each day is a single HTML row
+    with st.expander(f"📆 {day_date}", expanded=(i < 3)):
+        st.markdown(_render_day_html(meals), unsafe_allow_html=True)
 
-def _render_meal_slot(column, title, meal_data):
+def _render_day_html(meals):
     """
-    Renders a single meal slot (e.g., Breakfast) within a column.
+    Builds the Breakfast/Lunch/Dinner slots of a day as one HTML block,
+    instead of three columns with a separate st.image each.
     """
-    with column:
-        st.markdown(f"**{title}**")
-        if meal_data and "recipe" in meal_data:
-            recipe = meal_data["recipe"]
-            st.write(recipe.get("name", "Unknown"))
+    cells = []
+    for title, key in MEAL_SLOTS:
+        recipe = (meals.get(key) or {}).get("recipe")
+        if recipe:
+            # The API may send null fields: fall back before escaping
+            body = html.escape(recipe.get("name") or "Unknown")
             img = recipe.get("image")
             if img:
-                st.image(img, width=300)
+                body += f"<br>{lazy_img(img)}"
         else:
-            st.caption("No meal planned")
\ No newline at end of file
+            body = "<small>No meal planned</small>"
+        cells.append(f'<div style="flex: 1"><b>{title}</b><br>{body}</div>')
+    return f'<div style="display: flex; gap: 1rem">{"".join(cells)}</div>'
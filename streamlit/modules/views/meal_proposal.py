@@ -1,18 +1,19 @@
 import streamlit as st
 from modules.config import MEAL_PROPOSER_URL
-from modules.api import make_request
+from modules.api import make_request, fetch_image
 
 def render_meal_proposal():
     st.header("🍲 Meal Proposal")
     col1, col2 = st.columns([1, 2])
     
     with col1:
-        ingredient = st.text_input("Ingredient (optional)")
-        if st.button("Propose Meal"):
-            data = {"ingredient": ingredient} if ingredient else {}
-            res = make_request(f"{MEAL_PROPOSER_URL}/propose", method="POST", data=data)
-            if res:
-                st.session_state.proposed_meal = res
+        with st.form("propose_meal_form", border=False):
+            ingredient = st.text_input("Ingredient (optional)")
+            if st.form_submit_button("Propose Meal"):
+                data = {"ingredient": ingredient} if ingredient else {}
+                res = make_request(f"{MEAL_PROPOSER_URL}/propose", method="POST", data=data)
+                if res:
+                    st.session_state.proposed_meal = res
 
     with col2:
         if st.session_state.get("proposed_meal"):
@@ -22,7 +23,7 @@ def show_meal_details(meal):
     st.subheader(meal["name"])
     c_img, c_info = st.columns([1, 2])
     with c_img:
-        if meal.get("image"): st.image(meal["image"], width=300)
+        if meal.get("image"): st.image(fetch_image(meal["image"]), width=300)
     with c_info:
         st.write(f"**Category:** {meal.get('category')}")
         st.write(f"**Area:** {meal.get('area')}")
@@ -1,6 +1,6 @@
 import streamlit as st
-from modules.config import MEAL_PLANNER_URL
-from modules.api import make_request
+from modules.config import MEAL_PLANS_URL
+from modules.api import make_request, fetch_many, take_prefetched, get_user_meal_plans, get_plan_item_counts, clear_meal_plans
 
 def render_my_meal_plans():
     """
@@ -14,27 +14,32 @@ def render_my_meal_plans():
         return
 
     # Fetch list of plans
-    result = make_request(f"{MEAL_PLANNER_URL}/meal-plans/user/{user_id}")
+    result = take_prefetched("meal_plans")
+    if result is None:
+        result = get_user_meal_plans(user_id)
     
     if result and result.get("meal_plans"):
         plans = result.get("meal_plans")
+
+        # Fetch the item counts of all plans at once
+        counts_by_plan = _fetch_item_counts([plan.get("id") for plan in plans])
         
         for plan in plans:
             label = f"Plan from {plan.get('start_date')} to {plan.get('end_date')}"
             with st.expander(label):
                 st.caption(f"Created at: {plan.get('created_at')} | ID: {plan.get('id')}")
                 
-                # Fetch summary of items for preview (optional)
-                items_data = make_request(f"{MEAL_PLANNER_URL}/meal-plans/{plan.get('id')}/items")
-                if items_data and items_data.get("items"):
-                    st.write(f"Contains **{len(items_data['items'])}** meals.")
+                # Summary of items for preview (optional)
+                item_count = counts_by_plan.get(plan.get("id"))
+                if item_count:
+                    st.write(f"Contains **{item_count}** meals.")
                 
                 # Action Buttons
                 c1, c2 = st.columns([1, 4])
                 with c1:
                     # LOAD Action
                     if st.button("📂 Load Plan", key=f"load_p_{plan.get('id')}", type="primary"):
-                        full_plan = make_request(f"{MEAL_PLANNER_URL}/meal-plans/{plan.get('id')}/full")
+                        full_plan = make_request(f"{MEAL_PLANS_URL}/{plan.get('id')}/full")
                         if full_plan:
                             st.session_state.current_meal_plan = full_plan
                             st.success("Plan loaded into 'Meal Planning' tab!")
@@ -42,8 +47,24 @@ def render_my_meal_plans():
                 with c2:
                     # DELETE Action
                     if st.button("🗑️ Delete", key=f"del_p_{plan.get('id')}", type="secondary"):
-                        if make_request(f"{MEAL_PLANNER_URL}/meal-plans/{plan.get('id')}", method="DELETE"):
+                        if make_request(f"{MEAL_PLANS_URL}/{plan.get('id')}", method="DELETE"):
+                            clear_meal_plans()
                             st.toast("Plan deleted.")
                             st.rerun()
     else:
-        st.info("No saved meal plans found.")
\ No newline at end of file
+        st.info("No saved meal plans found.")
+
+def _fetch_item_counts(plan_ids):
+    """
+    Returns {plan_id: number of items} using the (cached) batch endpoint in a single call.
+    Falls back to parallel per-plan requests if the backend does not support it.
+    """
+    counts_by_plan = get_plan_item_counts(plan_ids)
+    if counts_by_plan is not None:
+        return counts_by_plan
+
+    items = fetch_many([f"{MEAL_PLANS_URL}/{pid}/items" for pid in plan_ids])
+    return {
+        pid: len(data.get("items") or []) if data else None
+        for pid, data in zip(plan_ids, items)
+    }
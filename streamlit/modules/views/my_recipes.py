@@ -1,8 +1,6 @@
 import streamlit as st
-from modules.config import RECIPE_CRUD_URL, API_VERSION
-from modules.api import make_request
-
-recipe_url = (f"{RECIPE_CRUD_URL}/{API_VERSION}") 
+from modules.config import RECIPES_URL
+from modules.api import make_request, get_user_recipes, clear_user_recipes, take_prefetched, fetch_image, SessionExpired, rerun_expired_session
 
 def render_recipe_interaction():
     """
@@ -19,17 +17,28 @@ def render_recipe_interaction():
     with tab2:
         _render_add_recipe_tab()
 
+@st.fragment
 def _render_view_recipes_tab():
     """
     Logic for fetching and displaying the list of recipes.
+    Runs as a fragment: its buttons rerun only this list, not the whole page.
     """
+    try:
+        _render_recipe_list()
+    except SessionExpired:
+        # Exceptions do not leave a fragment: main() reports it after the rerun
+        rerun_expired_session()
+
+def _render_recipe_list():
     user_id = st.session_state.get("user_id")
     if not user_id:
         st.error("Session Error: User ID missing. Please login.")
         return
 
     # Fetch recipes from CRUD Service
-    recipes = make_request(f"{recipe_url}/recipes/user/{user_id}")
+    recipes = take_prefetched("user_recipes")
+    if recipes is None:
+        recipes = get_user_recipes(user_id)
     
     if recipes:
         for recipe in recipes:
@@ -42,15 +51,16 @@ def _render_view_recipes_tab():
                     st.markdown("**Instructions:**")
                     st.write(recipe.get('instructions', 'No instructions provided.'))
                     if recipe.get("image"):
-                        st.image(recipe["image"], width=200)
+                        st.image(fetch_image(recipe["image"]), width=200)
 
                 with c2:
                     st.write("Actions")
                     # Delete Button
                     if st.button("🗑️ Delete", key=f"del_rec_{recipe['id']}", type="secondary"):
-                        if make_request(f"{recipe_url}/recipes/{recipe['id']}", method="DELETE"):
+                        if make_request(f"{RECIPES_URL}/{recipe['id']}", method="DELETE"):
+                            clear_user_recipes()
                             st.success("Deleted!")
-                            st.rerun()
+                            st.rerun(scope="fragment")
     else:
         st.info("You haven't saved any custom recipes yet.")
         st.write("Go to the 'Add Recipe' tab to create one.")
@@ -91,6 +101,7 @@ def _render_add_recipe_tab():
                 "tags": tags
             }
             
-            if make_request(f"{recipe_url}/recipes/", method="POST", data=payload):
+            if make_request(f"{RECIPES_URL}/", method="POST", data=payload):
+                clear_user_recipes()
                 st.success("Recipe saved successfully!")
                 st.rerun()
\ No newline at end of file
@@ -1,11 +1,33 @@
 import streamlit as st
-import urllib.parse
-from modules.config import RECIPES_FETCH_URL, RECIPE_CRUD_URL, API_VERSION
-from modules.api import make_request
-from modules.utils import get_ingredients_list
+import html
+import re
+from cachetools import TTLCache
+from modules.config import SEARCH_PREFETCH_ALL
+from modules.api import fetch_image, get_recipe_detail, get_recipe_details, SessionExpired, rerun_expired_session, get_categories, get_areas, search_recipes
+from modules.utils import get_ingredients_list, lazy_img
 from modules.components.reviews import render_reviews_section
 
-recipe_crud_url = f"{RECIPE_CRUD_URL}/{API_VERSION}"
+# Number of results whose details are fetched right after a search
+PREFETCH_TOP_K = 6
+
+# Results kept (and rendered) per search
+MAX_DISPLAY = 50
+
+# Result cards rendered per page
+PAGE_SIZE = 20
+
+# Line breaks (and runs of blank lines) become one paragraph break in markdown
+_NL_RE = re.compile(r"(?:\r?\n)+")
+
+# TheMealDB field -> canonical field of the recipe CRUD service
+_MEALDB_FIELDS = (
+    ("strMeal", "name"),
+    ("strMealThumb", "image"),
+    ("strCategory", "category"),
+    ("strArea", "area"),
+    ("strInstructions", "instructions"),
+)
+
 
 def render_recipe_search():
     """Entry point for the Recipe Search feature."""
@@ -16,19 +38,56 @@ def render_recipe_search():
     # 1. Handle filters & inputs
     perform_search = _render_search_filters()
     
-    # 2. Reset details cache on new search
+    # 2. New search: close the open card (loaded details are keyed by id and kept)
     if perform_search:
-        st.session_state.loaded_recipes = {} 
+        st.session_state.expanded_recipe_id = None
+        st.session_state.search_page = 0
+        # The first results are the likeliest to be opened: load them up front
+        to_prefetch = st.session_state.search_results
+        if not SEARCH_PREFETCH_ALL:
+            to_prefetch = to_prefetch[:PREFETCH_TOP_K]
+        if to_prefetch:
+            with st.spinner("Loading recipe details..."):
+                _prefetch_details(to_prefetch)
     
     # 3. Render the results grid
     _render_search_results()
 
+def _new_details_cache():
+    # Bounded so a long session does not keep every recipe it ever opened
+    return TTLCache(maxsize=128, ttl=1800)
+
 def _init_search_state():
     """Initialize the required session variables."""
     if "loaded_recipes" not in st.session_state: 
-        st.session_state.loaded_recipes = {}
+        st.session_state.loaded_recipes = _new_details_cache()
     if "search_results" not in st.session_state: 
         st.session_state.search_results = []
+    if "search_display" not in st.session_state:
+        st.session_state.search_display = []
+    if "search_truncated" not in st.session_state:
+        st.session_state.search_truncated = False
+    if "expanded_recipe_id" not in st.session_state:
+        st.session_state.expanded_recipe_id = None
+    if "search_page" not in st.session_state:
+        st.session_state.search_page = 0
+
+def _category_options():
+    cat_data = get_categories()
+    return [c["strCategory"] for c in cat_data.get("categories", [])] if cat_data else []
+
+def _area_options():
+    area_data = get_areas()
+    raw_list = (area_data.get("areas") or area_data.get("meals") or []) if area_data else []
+    return [a.get("strArea") for a in raw_list]
+
+# Search type -> (query parameter, input label, placeholder text or options loader)
+SEARCH_FIELDS = {
+    "Name": ("q", "Recipe Name", "e.g. Lasagna"),
+    "Ingredient": ("ingredient", "Ingredient", "e.g. Garlic"),
+    "Category": ("category", "Select Category", _category_options),
+    "Area": ("area", "Select Area", _area_options),
+}
 
 def _render_search_filters():
     """
@@ -38,167 +97,233 @@ def _render_search_filters():
     c1, c2 = st.columns([1, 3])
     
     with c1:
-        search_type = st.selectbox("Search By", ["Name", "Ingredient", "Category", "Area"])
-    
-    raw_response = None
-    search_triggered = False
+        search_type = st.selectbox("Search By", list(SEARCH_FIELDS))
     
-    base_search_url = f"{recipe_crud_url}/recipes/search"
+    param, label, source = SEARCH_FIELDS[search_type]
 
     with c2:
-        def execute_search(params_key, value):
-            if value:
-                safe_val = urllib.parse.quote_plus(value)
-                return make_request(f"{base_search_url}?{params_key}={safe_val}")
-            return None
-
-        # --- SEARCH BY NAME ---
-        if search_type == "Name":
-            query = st.text_input("Recipe Name", placeholder="e.g. Lasagna")
-            if st.button("Search", key="s_name"):
-                raw_response = execute_search("q", query)
-                search_triggered = True
-
-        # --- SEARCH BY INGREDIENT ---
-        elif search_type == "Ingredient":
-            query = st.text_input("Ingredient", placeholder="e.g. Garlic")
-            if st.button("Search", key="s_ing"):
-                raw_response = execute_search("ingredient", query)
-                search_triggered = True
-
-        # --- SEARCH BY CATEGORY ---
-        elif search_type == "Category":
-            cat_data = make_request(f"{RECIPES_FETCH_URL}/categories")
-            opts = [c["strCategory"] for c in cat_data.get("categories", [])] if cat_data else []
-            
-            sel = st.selectbox("Select Category", opts) if opts else None
-            if st.button("Search", key="s_cat") and sel:
-                raw_response = execute_search("category", sel)
-                search_triggered = True
-
-        # --- SEARCH BY AREA ---
-        elif search_type == "Area":
-            area_data = make_request(f"{RECIPES_FETCH_URL}/areas")
-            raw_list = []
-            if area_data:
-                raw_list = area_data.get("areas") or area_data.get("meals") or []
-            
-            opts = [a.get("strArea") for a in raw_list]
-            
-            if opts:
-                sel = st.selectbox("Select Area", opts)    
-                if st.button("Search", key="s_area"):
-                    raw_response = execute_search("area", sel)
-                    search_triggered = True
+        options = source() if callable(source) else None
+        if options == []:
+            st.warning(f"Could not load {search_type.lower()} list.")
+            return False
+
+        # Inputs live in forms so typing/selecting does not trigger reruns
+        with st.form(f"search_{search_type.lower()}_form", border=False):
+            if options is None:
+                value = st.text_input(label, placeholder=source)
             else:
-                st.warning("Could not load areas list.")
+                value = st.selectbox(label, options)
+            if not st.form_submit_button("Search"):
+                return False
 
     # Process results
-    if search_triggered:
-        final_results = []
-        if raw_response:
-            if isinstance(raw_response, list):
-                final_results = raw_response
-            elif isinstance(raw_response, dict) and "meals" in raw_response:
-                final_results = raw_response.get("meals") or []
-        
-        st.session_state.search_results = final_results
-        
-    return search_triggered
+    raw_response = search_recipes(param, value) if value else None
+    final_results = []
+    if isinstance(raw_response, list):
+        final_results = raw_response
+    elif isinstance(raw_response, dict):
+        final_results = raw_response.get("meals") or []
+    
+    # One extra unique result tells whether any were cut by MAX_DISPLAY
+    unique_results = _dedupe_results(final_results, limit=MAX_DISPLAY + 1)
+    st.session_state.search_truncated = len(unique_results) > MAX_DISPLAY
+    st.session_state.search_results = unique_results[:MAX_DISPLAY]
+    st.session_state.search_display = _build_display(st.session_state.search_results)
+    return True
+
+def _build_display(results):
+    """(label, uid, detail id, is_external, meal) per card, built once per search."""
+    display = []
+    for meal in results:
+        is_ext = meal["is_external_flag"]
+        source_label = "🌐 External" if is_ext else "🏠 Custom"
+        label = f"{meal.get('name') or 'Unknown Recipe'} ({source_label})"
+        uid = _detail_cache_key(meal["_pass_id"], is_ext)
+        display.append((label, uid, meal["_pass_id"], is_ext, meal))
+    return display
+
+def _normalize_meal(meal):
+    """Copies TheMealDB fields onto the canonical keys where those are empty."""
+    for src, dst in _MEALDB_FIELDS:
+        if not meal.get(dst) and meal.get(src):
+            meal[dst] = meal[src]
+    return meal
+
+def _signature(meal):
+    """Identifies the same dish across sources: (name, area, category)."""
+    name = (meal.get("name") or "").strip().lower()
+    return (name, meal.get("area") or "", meal.get("category") or "") if name else None
+
+def _dedupe_results(results, limit=MAX_DISPLAY):
+    """
+    Drops duplicate recipes (same source and id, first one wins) and tags each
+    kept meal with its source and detail id, once per search instead of per rerun.
+    An external recipe matching a custom one by _signature() is dropped as well.
+    Stops once `limit` recipes are kept: the rest is never shown.
+    """
+    unique = {}
+    ext_by_sig = {}
+    custom_sigs = set()
+    for meal in results:
+        if len(unique) >= limit:
+            break
+        is_ext = meal.get("source") == "external" or (meal.get("is_custom") is False)
+        pass_id = str(meal.get("external_id") if is_ext else meal.get("id"))
+        uid = ("ext" if is_ext else "int", pass_id)
+        if uid in unique:
+            continue
+        meal["is_external_flag"] = is_ext
+        meal["_pass_id"] = pass_id
+        sig = _signature(_normalize_meal(meal))
+
+        # Custom recipes win over external copies of the same dish
+        if sig is not None:
+            if is_ext:
+                if sig in custom_sigs:
+                    continue
+                ext_by_sig.setdefault(sig, []).append(uid)
+            else:
+                custom_sigs.add(sig)
+                for ext_uid in ext_by_sig.pop(sig, ()):
+                    unique.pop(ext_uid, None)
+        unique[uid] = meal
+    return list(unique.values())
 
 def _render_search_results():
     """Render search results grid supporting both Custom and External recipes."""    
-    if "search_results" not in st.session_state:
-        st.session_state.search_results = []
-
-    if not st.session_state.search_results:
+    results = st.session_state.search_results
+    if not results:
         return
 
-    seen_ids = set()
-    unique_results = []
+    st.success(f"Found {len(results)} recipes (Mixed Custom & External).")
+    if st.session_state.search_truncated:
+        st.caption(f"Showing the top {MAX_DISPLAY} results. Refine the search to see others.")
     
-    for meal in st.session_state.search_results:
-        internal_id = meal.get("id") 
-        external_id = meal.get("external_id")
-        
-        is_ext = meal.get("source") == "external" or (meal.get("is_custom") is False)
-        
-        if is_ext:
-            uid = f"ext_{external_id}"
-        else:
-            uid = f"int_{internal_id}"
-            
-        if uid not in seen_ids:
-            seen_ids.add(uid)
-            meal["is_external_flag"] = is_ext
-            unique_results.append(meal)
-            
-    st.success(f"Found {len(unique_results)} recipes (Mixed Custom & External).")
-    
-    for meal in unique_results:
-        is_ext = meal.get("is_external_flag", False)
-        name = meal.get("name") or "Unknown Recipe"
-        
-        pass_id = meal.get("external_id") if is_ext else meal.get("id")
-        
-        source_label = "🌐 External" if is_ext else "🏠 Custom"
-        label = f"{name} ({source_label})"
-        
-        with st.expander(label):
-            _render_single_recipe_detail(str(pass_id), meal, is_external=is_ext)
+    # Only the current page is rendered, and only the selected card of it
+    # renders its details (and reviews) on each rerun
+    page = st.session_state.search_page
+    open_id = st.session_state.expanded_recipe_id
+    display = st.session_state.search_display
+    for label, uid, pass_id, is_ext, meal in display[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
+        with st.expander(label, expanded=(uid == open_id)):
+            if uid == open_id:
+                _render_recipe_detail_fragment(pass_id, meal, is_ext)
+            else:
+                st.button("Show details", key=f"open_{uid}", on_click=_open_recipe, args=(uid,))
+
+    page_count = (len(results) + PAGE_SIZE - 1) // PAGE_SIZE
+    if page_count > 1:
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c1:
+            st.button("◀ Prev", key="search_prev", disabled=page == 0,
+                      on_click=_set_search_page, args=(page - 1,))
+        with c2:
+            st.caption(f"Page {page + 1} of {page_count}")
+        with c3:
+            st.button("Next ▶", key="search_next", disabled=page >= page_count - 1,
+                      on_click=_set_search_page, args=(page + 1,))
+
+def _set_search_page(page):
+    st.session_state.search_page = page
+    st.session_state.expanded_recipe_id = None
+
+def _open_recipe(uid):
+    st.session_state.expanded_recipe_id = uid
+
+def _detail_cache_key(item_id, is_external):
+    return f"{'ext' if is_external else 'int'}_{item_id}"
+
+def _extract_full_meal(full):
+    """
+    Normalizes a recipe detail response (list, MealDB dict or plain dict).
+    Works on a copy: the response comes from the detail cache shared by all sessions.
+    """
+    if isinstance(full, dict) and "meals" in full:
+        full = (full["meals"] or [None])[0]
+    elif isinstance(full, list):
+        full = full[0] if full else None
+    return _normalize_meal(dict(full)) if full else None
+
+def _prefetch_details(results):
+    """
+    Loads the full details of the results not loaded yet into loaded_recipes,
+    through the shared detail cache (missing ones are fetched concurrently).
+    """
+    loaded = st.session_state.loaded_recipes
+    results = [
+        meal for meal in results
+        if _detail_cache_key(meal["_pass_id"], meal["is_external_flag"]) not in loaded
+    ]
+    details = get_recipe_details(meal["_pass_id"] for meal in results)
+    for meal in results:
+        final_meal = _extract_full_meal(details.get(meal["_pass_id"]))
+        if final_meal:
+            key = _detail_cache_key(meal["_pass_id"], meal["is_external_flag"])
+            st.session_state.loaded_recipes[key] = final_meal
+
+@st.fragment
+def _render_recipe_detail_fragment(item_id, partial_data, is_external):
+    """
+    The open card as a fragment: its own buttons rerun only this card,
+    not the filters and the rest of the results grid.
+    """
+    try:
+        _render_single_recipe_detail(item_id, partial_data, is_external=is_external)
+    except SessionExpired:
+        # Exceptions do not leave a fragment: main() reports it after the rerun
+        rerun_expired_session()
 
 def _render_single_recipe_detail(item_id, partial_data, is_external=False):
     
     # 1. SESSION CACHE MANAGEMENT
-    cache_key = f"{'ext' if is_external else 'int'}_{item_id}"
+    cache_key = _detail_cache_key(item_id, is_external)
     cached_data = st.session_state.loaded_recipes.get(cache_key)
     
     meal = cached_data if cached_data else partial_data
     
-    name = meal.get("name") or meal.get("strMeal") or "Unknown Recipe"
+    name = meal.get("name") or "Unknown Recipe"
 
     # Check if full details are loaded
-    has_instructions = meal.get("instructions") or meal.get("strInstructions")
+    has_instructions = meal.get("instructions")
     
     if not has_instructions:
-        c1, c2 = st.columns([1, 4])
-        with c1:
-            thumb = meal.get("image") or meal.get("strMealThumb")
-            if thumb:
-                st.image(thumb, width="stretch")
-        with c2:
-            st.info(f"Summary view for {name}. Click below for details.")
-            
-            if st.button("📥 Load Full Details", key=f"load_{cache_key}"):
-                with st.spinner("Fetching data..."):
-                    url = f"{recipe_crud_url}/recipes/{item_id}"
-                    
-                    full = make_request(url)
-                    
-                    if full:
-                        final_meal = full[0] if isinstance(full, list) and full else full
-                        if isinstance(full, dict) and "meals" in full:
-                             final_meal = full["meals"][0]
-
-                        st.session_state.loaded_recipes[cache_key] = final_meal
-                        st.rerun()
+        # Thumbnail + summary as one HTML row instead of a columns pair
+        thumb = meal.get("image")
+        img = lazy_img(thumb, width=160) if thumb else ""
+        st.markdown(
+            f'<div style="display: flex; gap: 1rem; align-items: center">{img}'
+            f'<div>Summary view for <b>{html.escape(name)}</b>. Click below for details.</div></div>',
+            unsafe_allow_html=True
+        )
+        
+        if st.button("📥 Load Full Details", key=f"load_{cache_key}"):
+            with st.spinner("Fetching data..."):
+                final_meal = _extract_full_meal(get_recipe_detail(item_id))
+                
+                if final_meal:
+                    st.session_state.loaded_recipes[cache_key] = final_meal
+                    st.rerun(scope="fragment")
         return
 
     # --- RENDERING ---
-    category = meal.get("category") or meal.get("strCategory")
-    area = meal.get("area") or meal.get("strArea")
-    thumb = meal.get("image") or meal.get("strMealThumb")
+    category = meal.get("category")
+    area = meal.get("area")
+    thumb = meal.get("image")
     
-    raw_instructions = meal.get("instructions") or meal.get("strInstructions") or "No instructions."
-    instructions = raw_instructions.replace("\r\n", "\n\n").replace("\n", "\n\n")
+    instructions = meal.get("_fmt_instr")
+    if instructions is None:
+        raw_instructions = meal.get("instructions") or "No instructions."
+        instructions = meal["_fmt_instr"] = _NL_RE.sub("\n\n", raw_instructions)
 
     c_img, c_desc = st.columns([1, 2])
     with c_img:
-        if thumb: st.image(thumb, width="stretch")
+        if thumb: st.image(fetch_image(thumb), width="stretch")
         
         st.markdown("#### Ingredients")
-        for line in get_ingredients_list(meal):
-            st.caption(f"• {line}")
+        lines = get_ingredients_list(meal)
+        if lines:
+            # One element for the whole list instead of one per ingredient
+            st.markdown("<small>" + "<br>".join(map(html.escape, lines)) + "</small>", unsafe_allow_html=True)
             
     with c_desc:
         st.subheader(name)
@@ -206,7 +331,11 @@ def _render_single_recipe_detail(item_id, partial_data, is_external=False):
         st.write(instructions)
 
     st.divider()
-    
+
+    # Reviews (a fetch plus their widgets) only load once asked for
+    if not st.toggle("💬 Show reviews", key=f"rev_{cache_key}"):
+        return
+
     if is_external:
         rec_id_val = None
         ext_id_val = str(item_id)
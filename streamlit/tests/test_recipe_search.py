@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.views.recipe_search import _dedupe_results
+
+
+def _ext(ext_id, name):
+    return {"external_id": ext_id, "name": name, "source": "external", "is_custom": False}
+
+def _custom(recipe_id, name):
+    return {"id": recipe_id, "name": name, "source": "internal", "is_custom": True}
+
+
+class DedupeResultsTest(unittest.TestCase):
+    def _ids(self, results):
+        return [(meal["is_external_flag"], meal["_pass_id"]) for meal in results]
+
+    def test_custom_first_drops_matching_externals(self):
+        results = _dedupe_results([_custom(5, "X"), _ext(1, "X"), _ext(2, "x")])
+        self.assertEqual(self._ids(results), [(False, "5")])
+
+    def test_custom_after_externals_drops_all_of_them(self):
+        results = _dedupe_results([_ext(1, "X"), _ext(2, "x"), _custom(5, "X")])
+        self.assertEqual(self._ids(results), [(False, "5")])
+
+    def test_first_duplicate_wins(self):
+        results = _dedupe_results([_ext(1, "A"), _ext(1, "B")])
+        self.assertEqual([meal["name"] for meal in results], ["A"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,7 +35,7 @@ def run_test():
     
     try:
         # MODIFICA QUI SOTTO: Usa DB_URL invece di AUTH_URL
-        res = requests.post(f"{AUTH_URL}/auth/register", json=user_payload) 
+        res = session.post(f"{AUTH_URL}/auth/register", json=user_payload) 
         
         if res.status_code in [200, 201]:
             print(f"✅ Utente creato con successo: {res.json().get('username')}")
@@ -59,7 +59,7 @@ def run_test():
     }
     
     # OAuth2 standard usa form-data per il login
-    res = requests.post(f"{AUTH_URL}/auth/login", data=login_data)    
+    res = session.post(f"{AUTH_URL}/auth/login", data=login_data)    
     if res.status_code != 200:
         print(f"❌ Login fallito: {res.text}")
         sys.exit(1)
@@ -90,7 +90,7 @@ def run_test():
     }
 
     try:
-        res = requests.post(f"{RECIPE_URL}/recipes/", json=recipe_payload, headers=headers)
+        res = session.post(f"{RECIPE_URL}/recipes/", json=recipe_payload, headers=headers)
         
         if res.status_code in [200, 201]:
             recipe_data = res.json()
@@ -122,7 +122,7 @@ def run_test():
 
     try:
         # Nota: Endpoint ipotetico, adattalo se hai cambiato le rotte nel planner
-        res = requests.post(f"{PLANNER_URL}/meal-plans/", json=plan_payload, headers=headers)
+        res = session.post(f"{PLANNER_URL}/meal-plans/", json=plan_payload, headers=headers)
 
         if res.status_code in [200, 201]:
             plan_data = res.json()